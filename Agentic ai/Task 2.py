@@ -3,69 +3,80 @@
 # @markdown See the difference that system prompts make!
 
 class ComparativeStudy:
+    CATEGORIES = ['Confidence Score', 'Key Points Count', 'Response Depth']
+
     def __init__(self):
         self.agent = SimpleAgent()
+        # Build the figure skeleton once; each comparison only swaps in y-data
+        self._fig_template = go.Figure(
+            data=[
+                go.Bar(name='User Prompt Only', x=self.CATEGORIES, marker_color='blue'),
+                go.Bar(name='System Enhanced', x=self.CATEGORIES, marker_color='green')
+            ],
+            layout=go.Layout(
+                title='Prompting Strategy Comparison',
+                barmode='group',
+                yaxis_title='Score',
+                showlegend=True
+            )
+        )
     
-    def user_prompt_only(self, user_prompt: str) -> StructuredResponse:
+    async def user_prompt_only(self, user_prompt: str) -> StructuredResponse:
         """Response using only user prompt"""
-        return self.agent.get_structured_response(user_prompt)
-    
-    def system_prompt_enhanced(self, user_prompt: str, system_prompt: str) -> StructuredResponse:
-        """Response using system prompt + user prompt"""
-        enhanced_prompt = f"CONTEXT: {system_prompt}\n\nQUESTION: {user_prompt}"
-        return self.agent.get_structured_response(enhanced_prompt)
-    
-    def run_comparison(self, user_prompt: str, system_prompt: str):
+        return await self.agent.get_structured_response(user_prompt)
+
+    async def system_prompt_enhanced(self, user_prompt: str, system_prompt: str) -> StructuredResponse:
+        """Response using system prompt + user prompt as separate roles"""
+        return await self.agent.get_structured_response(user_prompt, system_prompt=system_prompt)
+
+    async def run_comparison(self, user_prompt: str, system_prompt: str):
         """Run comparative analysis with visualization"""
-        user_only = self.user_prompt_only(user_prompt)
-        system_enhanced = self.system_prompt_enhanced(user_prompt, system_prompt)
-        
-        # Create comparison visualization
-        categories = ['Confidence Score', 'Key Points Count', 'Response Depth']
+        # Overlap the two LLM round-trips so wall time is max, not sum
+        user_only, system_enhanced = await asyncio.gather(
+            self.user_prompt_only(user_prompt),
+            self.system_prompt_enhanced(user_prompt, system_prompt)
+        )
+
+        # Fill the prebuilt comparison visualization
         user_scores = [user_only.confidence_score, len(user_only.key_points), len(user_only.summary)]
         system_scores = [system_enhanced.confidence_score, len(system_enhanced.key_points), len(system_enhanced.summary)]
-        
-        fig = go.Figure(data=[
-            go.Bar(name='User Prompt Only', x=categories, y=user_scores, marker_color='blue'),
-            go.Bar(name='System Enhanced', x=categories, y=system_scores, marker_color='green')
-        ])
-        
-        fig.update_layout(
-            title='Prompting Strategy Comparison',
-            barmode='group',
-            yaxis_title='Score',
-            showlegend=True
-        )
-        
+
+        fig = go.Figure(self._fig_template)
+        fig.data[0].y = user_scores
+        fig.data[1].y = system_scores
+
         return user_only, system_enhanced, fig
 
 # Interactive Widget for Task 2
 print("📊 TASK 2: Comparative Study - System vs User Prompts")
 print("See how system prompts improve response quality!")
 
+# Layouts are read-only styling here, so both textareas can share one instance
+_BOX_LAYOUT = widgets.Layout(width='80%', height='60px')
+
 comparison_query = widgets.Textarea(
     value='What are the benefits of renewable energy?',
     placeholder='Enter your question here...',
     description='Query:',
-    layout=widgets.Layout(width='80%', height='60px')
+    layout=_BOX_LAYOUT
 )
 
 system_prompt = widgets.Textarea(
     value='You are an energy expert with 15 years experience. Provide detailed technical explanations with cost-benefit analysis and real-world examples.',
     placeholder='Enter system prompt here...',
     description='System:',
-    layout=widgets.Layout(width='80%', height='60px')
+    layout=_BOX_LAYOUT
 )
 
 compare_button = widgets.Button(description="Compare Responses", button_style='info')
 comparison_output = widgets.Output()
 
-def on_compare_click(b):
+async def on_compare_click(b):
     with comparison_output:
         clear_output()
         study = ComparativeStudy()
-        user_resp, system_resp, fig = study.run_comparison(comparison_query.value, system_prompt.value)
-        
+        user_resp, system_resp, fig = await study.run_comparison(comparison_query.value, system_prompt.value)
+
         print("🆚 COMPARISON RESULTS")
         print("=" * 60)
         
@@ -90,6 +101,6 @@ def on_compare_click(b):
         # Show visualization
         fig.show()
 
-compare_button.on_click(on_compare_click)
+compare_button.on_click(lambda b: asyncio.create_task(on_compare_click(b)))
 
 display(comparison_query, system_prompt, compare_button, comparison_output)
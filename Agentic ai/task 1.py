@@ -1 +1,187 @@
-# @title 🎯 Task 1: Simple Agent with Structured Responses# @markdown Interactive demo of structured AI responsesclass StructuredResponse(BaseModel):    """Structure for consistent LLM responses"""    summary: str    key_points: List[str]    confidence_score: float    category: str    follow_up_questions: List[str]class SimpleAgent:    def __init__(self):        self.conversation_history = []        def get_structured_response(self, user_prompt: str) -> StructuredResponse:        """Get structured response from LLM"""                # Enhanced mock LLM with better simulation        llm_response = self._call_llm_mock(user_prompt)                return llm_response        def _call_llm_mock(self, prompt: str) -> StructuredResponse:        """Enhanced mock LLM call with contextual responses"""                # Contextual responses based on prompt content        prompt_lower = prompt.lower()                if any(word in prompt_lower for word in ['ai', 'artificial intelligence', 'machine learning']):            return StructuredResponse(                summary="Artificial Intelligence refers to computer systems that can perform tasks typically requiring human intelligence, including learning, problem-solving, and pattern recognition.",                key_points=[                    "AI encompasses machine learning, deep learning, and neural networks",                    "Modern AI uses large datasets and advanced algorithms",                    "Applications include natural language processing, computer vision, and robotics",                    "Ethical considerations are crucial in AI development"                ],                confidence_score=0.94,                category="Technology",                follow_up_questions=[                    "What are the different types of machine learning?",                    "How do neural networks work?",                    "What are the ethical concerns with AI?"                ]            )        elif any(word in prompt_lower for word in ['climate', 'environment', 'renewable']):            return StructuredResponse(                summary="Climate change refers to long-term shifts in temperatures and weather patterns, primarily caused by human activities like burning fossil fuels.",                key_points=[                    "Global temperatures are rising due to greenhouse gas emissions",                    "Renewable energy sources can significantly reduce carbon footprint",                    "Climate change affects biodiversity and weather patterns",                    "International cooperation is essential for effective solutions"                ],                confidence_score=0.89,                category="Environment",                follow_up_questions=[                    "What are the most effective renewable energy sources?",                    "How can individuals reduce their carbon footprint?",                    "What are the economic impacts of climate change?"                ]            )        else:            return StructuredResponse(                summary=f"Comprehensive analysis of '{prompt}' covering key aspects and implications.",                key_points=[                    f"Important aspect 1 related to {prompt}",                    f"Critical consideration 2 regarding {prompt}",                    f"Practical application 3 of {prompt}",                    f"Future implications of {prompt} developments"                ],                confidence_score=0.85,                category="General Knowledge",                follow_up_questions=[                    f"Can you provide more details about specific aspects of {prompt}?",                    f"How does {prompt} relate to current technologies?",                    f"What are the challenges in implementing {prompt} solutions?"                ]            )# Interactive Widget for Task 1print("🔧 TASK 1: Simple Agent with Structured Responses")print("Try asking about: AI, climate change, machine learning, or any other topic!")task1_query = widgets.Textarea(    value='Explain artificial intelligence and its applications',    placeholder='Enter your question here...',    description='Query:',    layout=widgets.Layout(width='80%', height='80px'))task1_button = widgets.Button(description="Get Structured Response", button_style='success')task1_output = widgets.Output()def on_task1_click(b):    with task1_output:        clear_output()        agent = SimpleAgent()        response = agent.get_structured_response(task1_query.value)                print("🎯 STRUCTURED RESPONSE")        print("=" * 50)        print(f"📋 Summary: {response.summary}")        print(f"🎯 Confidence: {response.confidence_score:.2f}")        print(f"📁 Category: {response.category}")        print("\n🔑 Key Points:")        for i, point in enumerate(response.key_points, 1):            print(f"   {i}. {point}")        print("\n❓ Follow-up Questions:")        for i, question in enumerate(response.follow_up_questions, 1):            print(f"   {i}. {question}")task1_button.on_click(on_task1_click)display(task1_query, task1_button, task1_output)
\ No newline at end of file
+# @title 🎯 Task 1: Simple Agent with Structured Responses
+# @markdown Interactive demo of structured AI responses
+
+import functools
+import math
+import re
+
+def _embed_prompt(text: str) -> Dict[str, float]:
+    """Cheap local bag-of-words embedding for similarity lookups"""
+    counts = {}
+    for token in re.findall(r"[a-z0-9']+", text.lower()):
+        counts[token] = counts.get(token, 0) + 1
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    if not norm:
+        return {}
+    return {token: count / norm for token, count in counts.items()}
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Cosine similarity between two normalized embeddings"""
+    if len(b) < len(a):
+        a, b = b, a
+    return sum(weight * b.get(token, 0.0) for token, weight in a.items())
+
+def semantic_cache(threshold: float = 0.92):
+    """Serve repeated or near-duplicate prompts from cache instead of re-calling the LLM"""
+    def decorator(func):
+        cache = []  # L2: (embedding, response) pairs, shared across agent instances
+        exact = {}  # L1: exact (system, user) hits skip even the embedding step
+
+        @functools.wraps(func)
+        async def wrapper(self, user_prompt: str, system_prompt: str = None) -> StructuredResponse:
+            exact_key = (system_prompt, user_prompt)
+            cached = exact.get(exact_key)
+            if cached is not None:
+                return cached
+
+            query_embedding = _embed_prompt(user_prompt)
+            best_response, best_similarity = None, 0.0
+            for cached_system, embedding, response in cache:
+                if cached_system != system_prompt:
+                    continue  # system and user contributions must not collide
+                similarity = _cosine(query_embedding, embedding)
+                if similarity > best_similarity:
+                    best_response, best_similarity = response, similarity
+            if best_similarity >= threshold:
+                exact[exact_key] = best_response  # promote paraphrase hits to L1
+                return best_response
+            response = await func(self, user_prompt, system_prompt)
+            cache.append((system_prompt, query_embedding, response))
+            exact[exact_key] = response
+            return response
+
+        wrapper._semantic_cache = cache
+        wrapper._exact_cache = exact
+        return wrapper
+    return decorator
+
+class StructuredResponse(BaseModel):
+    """Structure for consistent LLM responses"""
+    summary: str
+    key_points: List[str]
+    confidence_score: float
+    category: str
+    follow_up_questions: List[str]
+
+class SimpleAgent:
+    def __init__(self):
+        self.conversation_history = []
+    
+    @staticmethod
+    def _build_messages(user_prompt: str, system_prompt: str = None) -> List[Dict]:
+        """Build role-tagged messages with the stable system text in prefix position"""
+        # The system block must stay byte-stable (no timestamps or random IDs)
+        # so provider-side prefix caching can reuse its KV prefix across calls.
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": user_prompt})
+        return messages
+
+    @semantic_cache(threshold=0.92)
+    async def get_structured_response(self, user_prompt: str, system_prompt: str = None) -> StructuredResponse:
+        """Get structured response from LLM (async so calls can be overlapped)"""
+
+        messages = self._build_messages(user_prompt, system_prompt)
+
+        # Enhanced mock LLM with better simulation; a real async client
+        # (e.g. the provider's async SDK) would be awaited here instead
+        llm_response = self._call_llm_mock(messages)
+
+        return llm_response
+
+    def _call_llm_mock(self, messages: List[Dict]) -> StructuredResponse:
+        """Enhanced mock LLM call with contextual responses"""
+
+        prompt = messages[-1]["content"]
+
+        # Contextual responses based on system + user content
+        prompt_lower = " ".join(message["content"] for message in messages).lower()
+
+        if any(word in prompt_lower for word in ['ai', 'artificial intelligence', 'machine learning']):
+            return StructuredResponse(
+                summary="Artificial Intelligence refers to computer systems that can perform tasks typically requiring human intelligence, including learning, problem-solving, and pattern recognition.",
+                key_points=[
+                    "AI encompasses machine learning, deep learning, and neural networks",
+                    "Modern AI uses large datasets and advanced algorithms",
+                    "Applications include natural language processing, computer vision, and robotics",
+                    "Ethical considerations are crucial in AI development"
+                ],
+                confidence_score=0.94,
+                category="Technology",
+                follow_up_questions=[
+                    "What are the different types of machine learning?",
+                    "How do neural networks work?",
+                    "What are the ethical concerns with AI?"
+                ]
+            )
+        elif any(word in prompt_lower for word in ['climate', 'environment', 'renewable']):
+            return StructuredResponse(
+                summary="Climate change refers to long-term shifts in temperatures and weather patterns, primarily caused by human activities like burning fossil fuels.",
+                key_points=[
+                    "Global temperatures are rising due to greenhouse gas emissions",
+                    "Renewable energy sources can significantly reduce carbon footprint",
+                    "Climate change affects biodiversity and weather patterns",
+                    "International cooperation is essential for effective solutions"
+                ],
+                confidence_score=0.89,
+                category="Environment",
+                follow_up_questions=[
+                    "What are the most effective renewable energy sources?",
+                    "How can individuals reduce their carbon footprint?",
+                    "What are the economic impacts of climate change?"
+                ]
+            )
+        else:
+            return StructuredResponse(
+                summary=f"Comprehensive analysis of '{prompt}' covering key aspects and implications.",
+                key_points=[
+                    f"Important aspect 1 related to {prompt}",
+                    f"Critical consideration 2 regarding {prompt}",
+                    f"Practical application 3 of {prompt}",
+                    f"Future implications of {prompt} developments"
+                ],
+                confidence_score=0.85,
+                category="General Knowledge",
+                follow_up_questions=[
+                    f"Can you provide more details about specific aspects of {prompt}?",
+                    f"How does {prompt} relate to current technologies?",
+                    f"What are the challenges in implementing {prompt} solutions?"
+                ]
+            )
+
+# Interactive Widget for Task 1
+print("🔧 TASK 1: Simple Agent with Structured Responses")
+print("Try asking about: AI, climate change, machine learning, or any other topic!")
+
+task1_query = widgets.Textarea(
+    value='Explain artificial intelligence and its applications',
+    placeholder='Enter your question here...',
+    description='Query:',
+    layout=widgets.Layout(width='80%', height='80px')
+)
+
+task1_button = widgets.Button(description="Get Structured Response", button_style='success')
+task1_output = widgets.Output()
+
+async def on_task1_click(b):
+    with task1_output:
+        clear_output()
+        agent = SimpleAgent()
+        response = await agent.get_structured_response(task1_query.value)
+
+        print("🎯 STRUCTURED RESPONSE")
+        print("=" * 50)
+        print(f"📋 Summary: {response.summary}")
+        print(f"🎯 Confidence: {response.confidence_score:.2f}")
+        print(f"📁 Category: {response.category}")
+        print("\n🔑 Key Points:")
+        for i, point in enumerate(response.key_points, 1):
+            print(f"   {i}. {point}")
+        print("\n❓ Follow-up Questions:")
+        for i, question in enumerate(response.follow_up_questions, 1):
+            print(f"   {i}. {question}")
+
+task1_button.on_click(lambda b: asyncio.create_task(on_task1_click(b)))
+
+display(task1_query, task1_button, task1_output)
\ No newline at end of file
@@ -3,40 +3,61 @@
 # @title 🌐 Task 3: Web-Search Agent - Real-time Information
 # @markdown Simulated real-time web search with multiple sources
 
+_RAW_SOURCES = {
+    "technology": ["Tech News Daily", "AI Research Hub", "Future Tech Review"],
+    "science": ["Science Journal", "Research Weekly", "Academic Insights"],
+    "health": ["Medical Today", "Health Digest", "Wellness Report"],
+    "business": ["Business Times", "Market Watch", "Economic Review"],
+    "general": ["Global News", "Information Network", "Knowledge Base"]
+}
+
+# Precompute the lowercase URL stem for every source once at import
+MOCK_SOURCES = {
+    category: tuple((name, name.lower().replace(" ", "")) for name in names)
+    for category, names in _RAW_SOURCES.items()
+}
+
 class WebSearchAgent:
     def __init__(self):
         self.search_history = []
-        self.mock_sources = {
-            "technology": ["Tech News Daily", "AI Research Hub", "Future Tech Review"],
-            "science": ["Science Journal", "Research Weekly", "Academic Insights"],
-            "health": ["Medical Today", "Health Digest", "Wellness Report"],
-            "business": ["Business Times", "Market Watch", "Economic Review"],
-            "general": ["Global News", "Information Network", "Knowledge Base"]
-        }
-    
-    async def mock_web_search(self, query: str, num_results: int = 3) -> List[Dict]:
-        """Enhanced mock web search with realistic data"""
+        self.mock_sources = MOCK_SOURCES
+
+    async def _fetch_one(self, source, query: str, query_slug: str, rank: int,
+                         category: str, current_time: datetime) -> Dict:
+        """Fetch one source's result (mocked network round-trip)"""
+        name, url_stem = source
         await asyncio.sleep(1)  # Simulate API delay
-        
+        return {
+            'title': f'{query} - Latest Updates #{rank+1}',
+            'link': f'https://{url_stem}.com/{query_slug}',
+            'snippet': f'Recent developments in {query}. New research shows significant progress in this area. Current data updated {current_time.strftime("%Y-%m-%d")}.',
+            'source': name,
+            'date': current_time.strftime("%Y-%m-%d %H:%M"),
+            'relevance_score': round(0.9 - (rank * 0.1), 2),
+            'category': category
+        }
+
+    def start_search(self, query: str, num_results: int = 3) -> List:
+        """Launch one fetch task per source and return the running tasks"""
         # Categorize query for relevant sources
         category = self._categorize_query(query)
         sources = self.mock_sources.get(category, self.mock_sources["general"])
-        
+
+        # Loop invariants hoisted: one slug, one timestamp for the whole batch
+        query_slug = query.replace(" ", "-")
         current_time = datetime.now()
-        results = []
-        
-        for i in range(num_results):
-            results.append({
-                'title': f'{query} - Latest Updates #{i+1}',
-                'link': f'https://{sources[i].lower().replace(" ", "")}.com/{query.replace(" ", "-")}',
-                'snippet': f'Recent developments in {query}. New research shows significant progress in this area. Current data updated {current_time.strftime("%Y-%m-%d")}.',
-                'source': sources[i],
-                'date': current_time.strftime("%Y-%m-%d %H:%M"),
-                'relevance_score': round(0.9 - (i * 0.1), 2),
-                'category': category
-            })
-        
-        self.search_history.append({"query": query, "results": len(results), "timestamp": current_time})
+
+        # Fan out so total latency is the slowest source, not the sum
+        return [
+            asyncio.create_task(
+                self._fetch_one(sources[i % len(sources)], query, query_slug, i, category, current_time))
+            for i in range(num_results)
+        ]
+
+    async def mock_web_search(self, query: str, num_results: int = 3) -> List[Dict]:
+        """Enhanced mock web search - one concurrent fetch per source"""
+        results = list(await asyncio.gather(*self.start_search(query, num_results)))
+        self.search_history.append({"query": query, "results": len(results), "timestamp": datetime.now()})
         return results
     
     def _categorize_query(self, query: str) -> str:
@@ -111,25 +132,35 @@ async def on_web_search_click(b):
     with web_search_output:
         clear_output()
         agent = WebSearchAgent()
-        response = await agent.get_real_time_response(web_search_query.value)
-        
+        query = web_search_query.value
+
         print("🌐 REAL-TIME SEARCH RESULTS")
         print("=" * 60)
-        print(f"📊 Query: {response['user_query']}")
-        print(f"📈 Sources: {len(response['search_metadata']['sources_used'])}")
-        print(f"🕒 Freshness: {response['search_metadata']['freshness']}")
-        
+        print(f"📊 Query: {query}")
+        print(f"\n📋 Individual Results (streamed as they arrive):")
+
+        # Render each result the moment its fetch lands instead of
+        # waiting for the slowest source
+        tasks = agent.start_search(query, 4)
+        results = []
+        for finished in asyncio.as_completed(tasks):
+            result = await finished
+            results.append(result)
+            print(f"   {len(results)}. [{result['source']}] {result['title']}")
+            print(f"      Relevance: {result['relevance_score']} | {result['date']} ({len(results)}/{len(tasks)} sources in)")
+
+        agent.search_history.append({"query": query, "results": len(results), "timestamp": datetime.now()})
+        synthesized = agent._synthesize_results(query, results)
+
+        print(f"\n📈 Sources: {len(set(r['source'] for r in results))}")
+        print(f"🕒 Freshness: current")
+
         print(f"\n🎯 Synthesized Answer:")
-        print(f"   {response['synthesized_response']['comprehensive_answer']}")
-        
+        print(f"   {synthesized['comprehensive_answer']}")
+
         print(f"\n🔍 Key Findings:")
-        for finding in response['synthesized_response']['key_findings']:
+        for finding in synthesized['key_findings']:
             print(f"   • {finding}")
-            
-        print(f"\n📋 Individual Results:")
-        for i, result in enumerate(response['search_results'], 1):
-            print(f"   {i}. [{result['source']}] {result['title']}")
-            print(f"      Relevance: {result['relevance_score']} | {result['date']}")
 
 web_search_button.on_click(lambda b: asyncio.create_task(on_web_search_click(b)))
 display(web_search_query, web_search_button, web_search_output)
\ No newline at end of file
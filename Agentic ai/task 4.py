@@ -3,12 +3,68 @@
 # @title 📚 Task 4: RAG Agent - Deep Research & Document Analysis
 # @markdown Advanced research with document retrieval and analysis
 
+_px = None
+
+def _get_px():
+    """Import plotly.express on first use so cell cold-start stays fast"""
+    global _px
+    if _px is None:
+        import plotly.express as px
+        _px = px
+    return _px
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _dense_scores(docs, query):
+        """Fused dot-product scan over a contiguous float32 matrix"""
+        n, dims = docs.shape
+        scores = np.empty(n, dtype=np.float32)
+        for i in numba.prange(n):
+            acc = np.float32(0.0)
+            for j in range(dims):
+                acc += docs[i, j] * query[j]
+            scores[i] = acc
+        return scores
+else:
+    def _dense_scores(docs, query):
+        """Pure-NumPy fallback when numba isn't installed"""
+        return docs @ query
+
+def topk_cosine(docs, query, top_k):
+    """Top-k cosine scores over L2-normalized dense vectors"""
+    scores = _dense_scores(docs, query)
+    top_k = min(top_k, len(scores))
+    top_indices = np.argpartition(scores, -top_k)[-top_k:]
+    top_indices = top_indices[np.argsort(scores[top_indices])[::-1]]
+    return top_indices, scores[top_indices]
+
 class RAGAgent:
+    # IDF weights drift as the corpus grows; refit once it doubles
+    REFIT_GROWTH_FACTOR = 2.0
+
     def __init__(self, knowledge_base: List[str] = None):
+        # sklearn is the heaviest import in the notebook; pay it only when an
+        # agent is actually built, not when the cell is run
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
         self.knowledge_base = knowledge_base or self._load_default_knowledge()
-        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-        self.document_vectors = None
+        # Hashing keeps ingestion stateless: no vocabulary to refit, fixed memory
+        self.vectorizer = HashingVectorizer(
+            n_features=2 ** 18, alternate_sign=False, norm=None, stop_words='english')
+        self.tfidf = TfidfTransformer()
+        self.term_counts = None
         self.research_history = []
+        self.dense_vectors = None
+        self.doc_int8 = None
+        self.doc_scale = None
+        self._embed_query = None
+        self._fitted_docs = 0
+        self._index_dirty = True
         self._build_vector_index()
     
     def _load_default_knowledge(self) -> List[str]:
@@ -27,35 +83,104 @@ class RAGAgent:
         ]
     
     def _build_vector_index(self):
-        """Build vector index for semantic search"""
+        """Build vector index for semantic search (refits IDF weights over the corpus)"""
         if self.knowledge_base:
-            self.document_vectors = self.vectorizer.fit_transform(self.knowledge_base)
+            self.term_counts = self.vectorizer.transform(self.knowledge_base)
+            # TfidfTransformer L2-normalizes rows, so similarity is a single sparse matmul
+            self.doc_norm = self.tfidf.fit_transform(self.term_counts)
+            self._fitted_docs = len(self.knowledge_base)
+            self._index_dirty = False
             print(f"📊 Vector index built with {len(self.knowledge_base)} documents")
-    
+
+    def _ensure_index(self):
+        """Rebuild the index lazily so back-to-back adds coalesce into one refit"""
+        if self._index_dirty:
+            self._build_vector_index()
+
     def add_documents(self, documents: List[str]):
-        """Add documents to knowledge base"""
+        """Add documents to knowledge base, transforming only the new batch"""
+        import scipy.sparse
+
         self.knowledge_base.extend(documents)
-        self._build_vector_index()
-    
+        if self.term_counts is None:
+            self._index_dirty = True
+            return
+
+        new_counts = self.vectorizer.transform(documents)
+        self.term_counts = scipy.sparse.vstack(
+            [self.term_counts, new_counts], format='csr')
+        self.doc_norm = scipy.sparse.vstack(
+            [self.doc_norm, self.tfidf.transform(new_counts)], format='csr')
+
+        # Weight new docs with the current IDF model; refit lazily once the
+        # corpus has grown enough for the weights to matter
+        if len(self.knowledge_base) >= self.REFIT_GROWTH_FACTOR * self._fitted_docs:
+            self._index_dirty = True
+
+    def load_dense_embeddings(self, embeddings, embed_query, quantize: bool = True):
+        """Switch retrieval to dense embeddings (rows aligned with the knowledge base)"""
+        dense = np.ascontiguousarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        dense /= norms
+        self._embed_query = embed_query
+
+        if quantize:
+            # Per-row symmetric int8: quarter the bytes the query scan has
+            # to pull through memory, with a per-row scale to recover scores
+            row_max = np.abs(dense).max(axis=1, keepdims=True)
+            row_max[row_max == 0] = 1.0
+            self.doc_int8 = np.ascontiguousarray(np.round(dense * (127.0 / row_max)).astype(np.int8))
+            self.doc_scale = (row_max / 127.0).ravel().astype(np.float32)
+            self.dense_vectors = None
+        else:
+            self.dense_vectors = dense
+            self.doc_int8 = None
+            self.doc_scale = None
+
+    def _topk_int8(self, query, top_k: int):
+        """Top-k scores against the int8-quantized document matrix"""
+        q_max = float(np.abs(query).max()) or 1.0
+        q_int = np.round(query * (127.0 / q_max)).astype(np.int32)
+        scores = (self.doc_int8 @ q_int).astype(np.float32) * self.doc_scale * (q_max / 127.0)
+        top_k = min(top_k, len(scores))
+        top_indices = np.argpartition(scores, -top_k)[-top_k:]
+        top_indices = top_indices[np.argsort(scores[top_indices])[::-1]]
+        return top_indices, scores[top_indices]
+
     def retrieve_relevant_documents(self, query: str, top_k: int = 3) -> List[str]:
         """Retrieve most relevant documents using semantic search"""
         if not self.knowledge_base:
             return []
-        
-        query_vector = self.vectorizer.transform([query])
-        similarities = cosine_similarity(query_vector, self.document_vectors).flatten()
-        
-        # Get top_k most similar documents
-        top_indices = similarities.argsort()[-top_k:][::-1]
+
+        if self.dense_vectors is not None or self.doc_int8 is not None:
+            query_dense = np.asarray(self._embed_query(query), dtype=np.float32)
+            query_norm = np.linalg.norm(query_dense)
+            if query_norm:
+                query_dense /= query_norm
+            if self.doc_int8 is not None:
+                top_indices, top_scores = self._topk_int8(query_dense, top_k)
+            else:
+                top_indices, top_scores = topk_cosine(self.dense_vectors, query_dense, top_k)
+        else:
+            self._ensure_index()
+            query_vector = self.tfidf.transform(self.vectorizer.transform([query]))
+            similarities = (query_vector @ self.doc_norm.T).toarray().ravel()
+
+            # Select top_k with argpartition (O(N)) and sort only those k
+            top_k = min(top_k, len(similarities))
+            top_indices = np.argpartition(similarities, -top_k)[-top_k:]
+            top_indices = top_indices[np.argsort(similarities[top_indices])[::-1]]
+            top_scores = similarities[top_indices]
+
         relevant_docs = []
-        
-        for idx in top_indices:
+        for idx, score in zip(top_indices, top_scores):
             relevant_docs.append({
                 'content': self.knowledge_base[idx],
-                'similarity_score': round(similarities[idx], 3),
+                'similarity_score': round(float(score), 3),
                 'doc_id': idx
             })
-        
+
         return relevant_docs
     
     def research_workflow(self, complex_query: str) -> Dict:
@@ -152,10 +277,11 @@ class RAGAgent:
             return
         
         # Create simple visualization
+        px = _get_px()
         doc_lengths = [len(doc.split()) for doc in self.knowledge_base]
         categories = [f"Doc {i+1}" for i in range(len(self.knowledge_base))]
-        
-        fig = px.bar(x=categories, y=doc_lengths, 
+
+        fig = px.bar(x=categories, y=doc_lengths,
                      title="Knowledge Base Document Analysis",
                      labels={'x': 'Documents', 'y': 'Word Count'})
         fig.show()
@@ -174,11 +300,21 @@ rag_query = widgets.Textarea(
 rag_button = widgets.Button(description="Start Research", button_style='success')
 rag_output = widgets.Output()
 
+# One shared agent so clicks don't re-pay the TF-IDF fit; built lazily on
+# first use so running the cell doesn't pay the sklearn import + fit either
+_rag_agent = None
+
+def _get_rag_agent():
+    global _rag_agent
+    if _rag_agent is None:
+        _rag_agent = RAGAgent()
+    return _rag_agent
+
 def on_rag_click(b):
     with rag_output:
         clear_output()
-        rag_agent = RAGAgent()
-        
+        rag_agent = _get_rag_agent()
+
         print("🔬 RAG RESEARCH WORKFLOW")
         print("=" * 60)
         
@@ -204,9 +340,8 @@ def on_rag_click(b):
         for i, doc in enumerate(result['relevant_documents'][:3], 1):
             print(f"   {i}. Score: {doc['similarity_score']} - {doc['content'][:100]}...")
 
-rag_button.on_click(on_rag_click)
-display(rag_query, rag_button, rag_output)
+        # Show knowledge base visualization
+        rag_agent.visualize_knowledge_base()
 
-# Show knowledge base visualization
-rag_agent = RAGAgent()
-rag_agent.visualize_knowledge_base()
\ No newline at end of file
+rag_button.on_click(on_rag_click)
+display(rag_query, rag_button, rag_output)
\ No newline at end of file